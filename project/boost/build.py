@@ -27,7 +27,7 @@ By default, only builds:
 '''
 
 import argparse
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 import logging
 import os.path
 import sys
@@ -50,6 +50,7 @@ DEFAULT_CONFIGURATIONS = (Configuration.DEBUG, Configuration.RELEASE,)
 DEFAULT_LINK = (Linkage.STATIC,)
 DEFAULT_RUNTIME_LINK = Linkage.STATIC
 DEFAULT_TOOLSET_VERSION = ToolsetVersion.default()
+DEFAULT_JOBS = 1
 B2_QUIET = ['warnings=off', '-d0']
 B2_VERBOSE = ['warnings=all', '-d2', '--debug-configuration']
 
@@ -57,7 +58,7 @@ B2_VERBOSE = ['warnings=all', '-d2', '--debug-configuration']
 class BuildParameters:
     def __init__(self, boost_dir, build_dir=None, platforms=None,
                  configurations=None, link=None, runtime_link=None,
-                 toolset_version=None, verbose=False, b2_args=None):
+                 toolset_version=None, jobs=None, verbose=False, b2_args=None):
 
         boost_dir = normalize_path(boost_dir)
         if build_dir is not None:
@@ -67,6 +68,7 @@ class BuildParameters:
         link = link or DEFAULT_LINK
         runtime_link = runtime_link or DEFAULT_RUNTIME_LINK
         toolset_version = toolset_version or DEFAULT_TOOLSET_VERSION
+        jobs = jobs or DEFAULT_JOBS
         verbosity = B2_VERBOSE if verbose else B2_QUIET
         if b2_args:
             b2_args = verbosity + b2_args
@@ -80,6 +82,7 @@ class BuildParameters:
         self.link = link
         self.runtime_link = runtime_link
         self.toolset_version = toolset_version
+        self.jobs = jobs
         self.b2_args = b2_args
 
     @staticmethod
@@ -89,13 +92,51 @@ class BuildParameters:
         return BuildParameters(**args)
 
     def enum_b2_args(self):
-        with self._create_build_dir() as build_dir:
-            for platform in self.platforms:
-                toolset = Toolset.make(self.toolset_version, platform)
-                for configuration in self.configurations:
-                    for link, runtime_link in self._enum_linkage_options():
-                        with self._b2_args(build_dir, toolset, platform, configuration, link, runtime_link) as args:
-                            yield args
+        with self._create_build_dir() as build_dir, ExitStack() as stack:
+            for _, args in self._enum_b2_args(build_dir, stack):
+                yield args
+
+    @contextmanager
+    def all_b2_args(self):
+        '''Same as enum_b2_args, but keeps every set of arguments valid until
+        the context is exited, so that b2 can be run concurrently.
+
+        The arguments are grouped by the --stagedir directory.  It's shared by
+        the linkage variants, and can be shared by different platforms too
+        (e.g. 'auto' is the host platform on Windows), so the invocations from
+        one group must be run one after another; only the groups themselves
+        can be run concurrently.  They mustn't share the build directory, so
+        every group gets its own subdirectory.
+        '''
+        with self._create_build_dir() as build_dir, ExitStack() as stack:
+            groups = {}
+            b2_args = self._enum_b2_args(build_dir, stack, split_build_dir=True)
+            for stagedir, args in b2_args:
+                groups.setdefault(stagedir, []).append(args)
+            yield list(groups.values())
+
+    def _enum_b2_args(self, build_dir, stack, split_build_dir=False):
+        linkage_options = list(self._enum_linkage_options())
+        for platform in self.platforms:
+            toolset = Toolset.make(self.toolset_version, platform)
+            # The toolset (and its user config file, if any) only depends on
+            # the platform; reuse it for every configuration/linkage.
+            toolset_args = stack.enter_context(toolset.b2_args())
+            for configuration in self.configurations:
+                stagedir = platform.stagedir(configuration)
+                job_dir = build_dir
+                if split_build_dir:
+                    job_dir = self._job_build_dir(build_dir, stagedir)
+                # These don't depend on the linkage options:
+                variant_args = self._variant_args(platform, configuration)
+                for link, runtime_link in linkage_options:
+                    args = self._b2_args(job_dir, toolset_args, variant_args, link, runtime_link)
+                    yield stagedir, args
+
+    @staticmethod
+    def _job_build_dir(build_dir, stagedir):
+        # stage/PLATFORM/CONFIGURATION -> stage_PLATFORM_CONFIGURATION
+        return os.path.join(build_dir, stagedir.replace(os.sep, '_'))
 
     def _enum_linkage_options(self):
         for link in self.link:
@@ -124,17 +165,33 @@ class BuildParameters:
                 logging.info('Removing build directory: %s', build_dir)
             return
 
-    @contextmanager
-    def _b2_args(self, build_dir, toolset, platform, configuration, link, runtime_link):
-        with toolset.b2_args() as result:
-            result.append(f'--build-dir={build_dir}')
-            result.append('--layout=system')
-            result += platform.b2_args(configuration)
-            result += configuration.b2_args()
-            result += link.b2_args()
-            result += runtime_link.b2_args('runtime-link')
-            result += self.b2_args
-            yield result
+    @staticmethod
+    def _variant_args(platform, configuration):
+        return [
+            *platform.b2_args(configuration),
+            *configuration.b2_args(),
+        ]
+
+    def _b2_args(self, build_dir, toolset_args, variant_args, link, runtime_link):
+        return [
+            *toolset_args,
+            f'--build-dir={build_dir}',
+            '--layout=system',
+            *variant_args,
+            *link.b2_args(),
+            *runtime_link.b2_args('runtime-link'),
+            *self.b2_args,
+        ]
+
+
+def _parse_jobs(s):
+    try:
+        jobs = int(s)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f'invalid number of jobs: {s}') from e
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f'number of jobs must be positive: {s}')
+    return jobs
 
 
 def build(params):
@@ -186,6 +243,13 @@ def _parse_args(argv=None):
     parser.add_argument('--help-toolsets', action='store_true',
                         help='show detailed info about supported toolsets')
 
+    # Every platform/configuration/linkage combination requires a separate b2
+    # invocation.  The ones that use different --stagedir directories can be
+    # run concurrently.
+    parser.add_argument('--jobs', metavar='N',
+                        type=_parse_jobs, default=DEFAULT_JOBS,
+                        help='number of stage directories to build concurrently')
+
     parser.add_argument('--build', metavar='DIR', dest='build_dir',
                         type=normalize_path,
                         help='Boost build directory (temporary directory unless specified)')
@@ -3,6 +3,7 @@
 # For details, see https://github.com/egor-tensin/cmake-common.
 # Distributed under the MIT License.
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 import os.path
 
@@ -36,9 +37,31 @@ class BoostDir:
             run([self._bootstrap_path()] + self._bootstrap_args(params.toolset_version))
 
     def _b2(self, params):
-        for b2_params in params.enum_b2_args():
+        if params.jobs > 1:
+            self._b2_concurrently(params)
+            return
+        self._b2_sequentially(params.enum_b2_args())
+
+    def _b2_sequentially(self, all_b2_params):
+        for b2_params in all_b2_params:
             run([self._b2_path()] + b2_params)
 
+    def _b2_concurrently(self, params):
+        # The b2 processes do the actual work, so threads are enough here.
+        with params.all_b2_args() as groups:
+            logging.info('Running %d groups of b2 invocations, %d at a time',
+                         len(groups), params.jobs)
+            with ThreadPoolExecutor(max_workers=params.jobs) as executor:
+                futures = [executor.submit(self._b2_sequentially, group) for group in groups]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except:
+                    # Don't start the groups that are still queued.
+                    for future in futures:
+                        future.cancel()
+                    raise
+
     @staticmethod
     def _bootstrap_path():
         return os.path.join('.', BoostDir._bootstrap_name())
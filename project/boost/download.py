@@ -16,6 +16,9 @@ Usage examples:
 
     $ boost-download --unpack ~/workspace/third-party/ 1.65.0
     ...
+
+If the destination directory already contains the same Boost version unpacked
+by this script (e.g. restored from a CI cache), nothing is downloaded.
 '''
 
 import argparse
@@ -32,6 +35,9 @@ import project.version
 
 
 class Download:
+    # Written to the root Boost directory after it's been unpacked.
+    VERSION_FILE = '.cmake-common-version'
+
     def __init__(self, version, unpack_dir=None, cache_dir=None,
                  dest_path=None, no_retry=False):
         if unpack_dir is None:
@@ -63,6 +69,26 @@ class Download:
         if self.dest_path is not None:
             os.rename(boost_dir.path, self.dest_path)
 
+    @property
+    def boost_dir_path(self):
+        if self.dest_path is not None:
+            return self.dest_path
+        return self.version.dir_path(self.unpack_dir)
+
+    def _version_file_path(self):
+        return os.path.join(self.boost_dir_path, Download.VERSION_FILE)
+
+    def is_unpacked(self):
+        try:
+            with open(self._version_file_path()) as fd:
+                return fd.read() == str(self.version)
+        except FileNotFoundError:
+            return False
+
+    def mark_unpacked(self):
+        with open(self._version_file_path(), mode='w') as fd:
+            fd.write(str(self.version))
+
     @staticmethod
     def _download_url(url):
         with urllib.request.urlopen(url, timeout=20) as request:
@@ -115,10 +141,14 @@ class Download:
 
 
 def download(params):
+    if params.is_unpacked():
+        logging.info('Boost %s is already unpacked: %s', params.version, params.boost_dir_path)
+        return
     with params.download_if_necessary() as path:
         archive = Archive(params.version, path)
         boost_dir = archive.unpack(params.unpack_dir)
         params.rename_if_necessary(boost_dir)
+    params.mark_unpacked()
 
 
 def _parse_args(argv=None):
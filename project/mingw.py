@@ -3,6 +3,8 @@
 # For details, see https://github.com/egor-tensin/cmake-common.
 # Distributed under the MIT License.
 
+import functools
+
 
 class MinGW:
     def __init__(self, platform):
@@ -25,3 +27,9 @@ class MinGW:
 
     def windres(self):
         return self._get('windres')
+
+
+@functools.lru_cache(maxsize=None)
+def for_platform(platform):
+    # The tool names only depend on the platform.
+    return MinGW(platform)
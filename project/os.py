@@ -4,6 +4,7 @@
 # Distributed under the MIT License.
 
 from enum import Enum
+import functools
 import platform
 
 
@@ -17,6 +18,7 @@ class OS(Enum):
         return str(self.value)
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def current():
         system = platform.system()
         if system == 'Windows':
@@ -107,19 +107,10 @@ class Platform(Enum):
     def cmake_toolset_file(self):
         # For Makefile generators, we make a special toolset file that
         # specifies the -m32/-m64 flags, etc.
-        if self is Platform.AUTO:
-            # Let the compiler decide.
-            return ''
-        if self is Platform.X86:
-            address_model = 32
-        elif self is Platform.X64:
-            address_model = 64
-        else:
-            raise NotImplementedError(f'unsupported platform: {self}')
-        return f'''
-set(CMAKE_C_FLAGS   -m{address_model})
-set(CMAKE_CXX_FLAGS -m{address_model})
-'''
+        try:
+            return _CMAKE_TOOLSET_FILES[self]
+        except KeyError:
+            raise NotImplementedError(f'unsupported platform: {self}') from None
 
     def msvc_arch(self):
         '''Maps to CMake's -A argument for MSVC.'''
@@ -135,3 +126,19 @@ set(CMAKE_CXX_FLAGS -m{address_model})
         if self is Platform.X64:
             return 'x64'
         raise NotImplementedError(f'unsupported platform: {self}')
+
+
+def _cmake_toolset_file(address_model):
+    return f'''
+set(CMAKE_C_FLAGS   -m{address_model})
+set(CMAKE_CXX_FLAGS -m{address_model})
+'''
+
+
+# There're only a few of these, so they're formatted once.
+_CMAKE_TOOLSET_FILES = {
+    # Let the compiler decide.
+    Platform.AUTO: '',
+    Platform.X86: _cmake_toolset_file(32),
+    Platform.X64: _cmake_toolset_file(64),
+}
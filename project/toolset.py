@@ -29,14 +29,14 @@ import argparse
 from contextlib import contextmanager
 from decimal import Decimal
 from enum import Enum
+import functools
 import logging
 import os.path
-import shutil
 
 import project.mingw
 from project.os import on_windows
 from project.platform import Platform
-from project.utils import full_exe_name, temp_file
+from project.utils import full_exe_name, temp_file, which
 
 
 class MSVCVersion(Enum):
@@ -86,21 +86,10 @@ class MSVCVersion(Enum):
         return self
 
     def to_visual_studio_version(self):
-        if MSVCVersion.VS2010:
-            return VisualStudioVersion.VS2010
-        if MSVCVersion.VS2012:
-            return VisualStudioVersion.VS2012
-        if MSVCVersion.VS2013:
-            return VisualStudioVersion.VS2013
-        if MSVCVersion.VS2015:
-            return VisualStudioVersion.VS2015
-        if MSVCVersion.VS2017:
-            return VisualStudioVersion.VS2017
-        if MSVCVersion.VS2019:
-            return VisualStudioVersion.VS2019
-        if MSVCVersion.VS2022:
-            return VisualStudioVersion.VS2022
-        raise NotImplementedError(f'unsupported MSVC version: {self}')
+        try:
+            return _MSVC_TO_VISUAL_STUDIO[self]
+        except KeyError:
+            raise NotImplementedError(f'unsupported MSVC version: {self}') from None
 
     def to_boost_msvc_version(self):
         try:
@@ -156,26 +145,28 @@ class VisualStudioVersion(Enum):
         return tuple(VisualStudioVersion)
 
     def to_msvc_version(self):
-        if self is VisualStudioVersion.VS2010:
-            return MSVCVersion.VS2010
-        if self is VisualStudioVersion.VS2012:
-            return MSVCVersion.VS2012
-        if self is VisualStudioVersion.VS2013:
-            return MSVCVersion.VS2013
-        if self is VisualStudioVersion.VS2015:
-            return MSVCVersion.VS2015
-        if self is VisualStudioVersion.VS2017:
-            return MSVCVersion.VS2017
-        if self is VisualStudioVersion.VS2019:
-            return MSVCVersion.VS2019
-        if self is VisualStudioVersion.VS2022:
-            return MSVCVersion.VS2022
-        raise NotImplementedError(f'unsupported Visual Studio version: {self}')
+        try:
+            return _VISUAL_STUDIO_TO_MSVC[self]
+        except KeyError:
+            raise NotImplementedError(f'unsupported Visual Studio version: {self}') from None
 
     def to_visual_studio_version(self):
         return self
 
 
+_MSVC_TO_VISUAL_STUDIO = {
+    MSVCVersion.VS2010: VisualStudioVersion.VS2010,
+    MSVCVersion.VS2012: VisualStudioVersion.VS2012,
+    MSVCVersion.VS2013: VisualStudioVersion.VS2013,
+    MSVCVersion.VS2015: VisualStudioVersion.VS2015,
+    MSVCVersion.VS2017: VisualStudioVersion.VS2017,
+    MSVCVersion.VS2019: VisualStudioVersion.VS2019,
+    MSVCVersion.VS2022: VisualStudioVersion.VS2022,
+}
+
+_VISUAL_STUDIO_TO_MSVC = {vs: msvc for msvc, vs in _MSVC_TO_VISUAL_STUDIO.items()}
+
+
 class ToolsetType(Enum):
     AUTO = 'auto'
     MSVC = 'msvc'
@@ -338,30 +329,20 @@ class Toolset(abc.ABC):
 
     @staticmethod
     def detect(version):
-        if version.hint is ToolsetType.AUTO:
-            return Auto
-        if version.hint is ToolsetType.MSVC or version.hint is ToolsetType.VISUAL_STUDIO:
-            return MSVC
-        if version.hint is ToolsetType.GCC:
-            return GCC
-        if version.hint is ToolsetType.MINGW:
-            return MinGW
-        if version.hint is ToolsetType.CLANG:
-            return Clang
-        if version.hint is ToolsetType.CLANG_CL:
-            return ClangCL
-        raise NotImplementedError(f'unrecognized toolset: {version}')
+        try:
+            return _TOOLSETS[version.hint]
+        except KeyError:
+            raise NotImplementedError(f'unrecognized toolset: {version}') from None
+
+    @classmethod
+    def from_version(cls, version, platform):
+        return cls()
 
     @staticmethod
     def make(version, platform):
         # Platform is required here, since some toolsets (MinGW-w64) require
         # it for the compiler path.
-        cls = Toolset.detect(version)
-        if cls is MinGW:
-            return MinGW(platform)
-        if version.hint.is_versioned:
-            return cls(version.version)
-        return cls()
+        return Toolset.detect(version).from_version(version, platform)
 
 
 class Auto(Toolset):
@@ -388,6 +369,10 @@ class MSVC(Toolset):
     def __init__(self, version=None):
         self.version = version
 
+    @classmethod
+    def from_version(cls, version, platform):
+        return cls(version.version)
+
     def b2_toolset(self):
         if self.version is not None:
             return f'msvc-{self.version.to_msvc_version().to_boost_msvc_version()}'
@@ -469,7 +454,7 @@ class CMakeCustom(Toolset):
     @staticmethod
     def makefiles():
         if on_windows():
-            if shutil.which('mingw32-make'):
+            if which('mingw32-make'):
                 return 'MinGW Makefiles'
             return 'Unix Makefiles'
         # On Linux/Cygwin, make all the way:
@@ -480,15 +465,28 @@ class CMakeCustom(Toolset):
         if on_windows():
             # MinGW utilities like make might be unavailable, but NMake can
             # very much be there.
-            if shutil.which('nmake'):
+            if which('nmake'):
                 return 'NMake Makefiles'
         return CMakeCustom.cmake_generator()
 
     @staticmethod
     def _cmake_write_config(build_dir, contents):
         path = os.path.join(build_dir, 'custom_toolchain.cmake')
-        with open(path, mode='w') as file:
+        # Don't touch the file if it's up-to-date: bumping its mtime makes
+        # CMake redo all the compiler checks on the next reconfigure.
+        try:
+            with open(path, mode='rb') as file:
+                if file.read() == contents:
+                    logging.info('Toolchain file is up-to-date: %s', path)
+                    return path
+        except FileNotFoundError:
+            pass
+        # Write to a temporary file first so that a half-written toolchain
+        # file is never left behind.
+        tmp_path = path + '.tmp'
+        with open(tmp_path, mode='wb') as file:
             file.write(contents)
+        os.replace(tmp_path, path)
         return path
 
     @abc.abstractmethod
@@ -496,7 +494,10 @@ class CMakeCustom(Toolset):
         pass
 
     def cmake_args(self, build_dir, platform):
-        contents = self.cmake_format_config(platform)
+        contents = self.cmake_format_config(platform) + _cmake_compiler_launcher()
+        # CMake doesn't care about line endings; write the file as-is, without
+        # any newline translation.
+        contents = contents.encode()
         config_path = self._cmake_write_config(build_dir, contents)
 
         return super().cmake_args(build_dir, platform) + [
@@ -504,10 +505,28 @@ class CMakeCustom(Toolset):
         ]
 
 
+@functools.lru_cache(maxsize=None)
+def _cmake_compiler_launcher():
+    # Use ccache if it's available, unless CMAKE_COMMON_USE_CCACHE=0.
+    if os.environ.get('CMAKE_COMMON_USE_CCACHE', '1') == '0':
+        return ''
+    if which('ccache') is None:
+        return ''
+    return '''
+set(CMAKE_C_COMPILER_LAUNCHER   ccache)
+set(CMAKE_CXX_COMPILER_LAUNCHER ccache)
+'''
+
+
 class GCC(BoostCustom, CMakeCustom):
     # Force GCC.  We don't care whether it's a native Linux GCC or a
     # MinGW-flavoured GCC on Windows.
 
+    CMAKE_CONFIG = '''
+set(CMAKE_C_COMPILER   gcc)
+set(CMAKE_CXX_COMPILER g++)
+'''
+
     def __init__(self):
         BoostCustom.__init__(self, 'gcc', 'g++', self.b2_build_options())
         CMakeCustom.__init__(self)
@@ -525,14 +544,11 @@ class GCC(BoostCustom, CMakeCustom):
         return []
 
     def cmake_format_config(self, platform):
-        return f'''
-set(CMAKE_C_COMPILER   gcc)
-set(CMAKE_CXX_COMPILER g++)
-{platform.cmake_toolset_file()}'''
+        return GCC.CMAKE_CONFIG + platform.cmake_toolset_file()
 
 
 def _gcc_or_auto():
-    if shutil.which('gcc') is not None:
+    if which('gcc') is not None:
         return ['gcc']
     return []
 
@@ -543,10 +559,14 @@ class MinGW(BoostCustom, CMakeCustom):
     # "ar").
 
     def __init__(self, platform):
-        self.paths = project.mingw.MinGW(platform)
+        self.paths = project.mingw.for_platform(platform)
         BoostCustom.__init__(self, 'gcc', self.paths.gxx(), self.b2_build_options())
         CMakeCustom.__init__(self)
 
+    @classmethod
+    def from_version(cls, version, platform):
+        return cls(platform)
+
     @staticmethod
     def bootstrap_bat_args():
         # On Windows, prefer GCC if it's available.
@@ -562,16 +582,27 @@ class MinGW(BoostCustom, CMakeCustom):
 
     def cmake_format_config(self, platform):
         return f'''
-set(CMAKE_C_COMPILER   {self.paths.gcc()})
-set(CMAKE_CXX_COMPILER {self.paths.gxx()})
-set(CMAKE_AR           {self.paths.ar()})
-set(CMAKE_RANLIB       {self.paths.ranlib()})
-set(CMAKE_RC_COMPILER  {self.paths.windres()})
-set(CMAKE_SYSTEM_NAME  Windows)
+set(CMAKE_C_COMPILER       {self.paths.gcc()})
+set(CMAKE_CXX_COMPILER     {self.paths.gxx()})
+set(CMAKE_AR               {self.paths.ar()})
+set(CMAKE_RANLIB           {self.paths.ranlib()})
+set(CMAKE_RC_COMPILER      {self.paths.windres()})
+set(CMAKE_SYSTEM_NAME      Windows)
+set(CMAKE_SYSTEM_PROCESSOR {self.paths.prefix})
 '''
 
 
 class Clang(BoostCustom, CMakeCustom):
+    CMAKE_CONFIG = '''
+if(CMAKE_VERSION VERSION_LESS "3.15" AND WIN32)
+    set(CMAKE_C_COMPILER   clang-cl)
+    set(CMAKE_CXX_COMPILER clang-cl)
+else()
+    set(CMAKE_C_COMPILER   clang)
+    set(CMAKE_CXX_COMPILER clang++)
+endif()
+'''
+
     def __init__(self):
         BoostCustom.__init__(self, 'clang', 'clang++', self.b2_build_options())
         CMakeCustom.__init__(self)
@@ -602,9 +633,9 @@ class Clang(BoostCustom, CMakeCustom):
         ]
         if on_windows():
             # Prefer LLVM binutils:
-            if shutil.which('llvm-ar') is not None:
+            if which('llvm-ar') is not None:
                 options.append(('archiver', 'llvm-ar'))
-            if shutil.which('llvm-ranlib') is not None:
+            if which('llvm-ranlib') is not None:
                 options.append(('ranlib', 'llvm-ranlib'))
         return options
 
@@ -627,15 +658,7 @@ class Clang(BoostCustom, CMakeCustom):
 '''
 
     def cmake_format_config(self, platform):
-        return f'''
-if(CMAKE_VERSION VERSION_LESS "3.15" AND WIN32)
-    set(CMAKE_C_COMPILER   clang-cl)
-    set(CMAKE_CXX_COMPILER clang-cl)
-else()
-    set(CMAKE_C_COMPILER   clang)
-    set(CMAKE_CXX_COMPILER clang++)
-endif()
-{platform.cmake_toolset_file()}'''
+        return Clang.CMAKE_CONFIG + platform.cmake_toolset_file()
 
     @staticmethod
     def cmake_generator():
@@ -643,6 +666,12 @@ endif()
 
 
 class ClangCL(CMakeCustom):
+    CMAKE_CONFIG = '''
+set(CMAKE_C_COMPILER   clang-cl)
+set(CMAKE_CXX_COMPILER clang-cl)
+set(CMAKE_SYSTEM_NAME  Windows)
+'''
+
     @contextmanager
     def b2_args(self):
         yield [
@@ -662,12 +691,19 @@ class ClangCL(CMakeCustom):
         return Clang.bootstrap_sh_args()
 
     def cmake_format_config(self, platform):
-        return f'''
-set(CMAKE_C_COMPILER   clang-cl)
-set(CMAKE_CXX_COMPILER clang-cl)
-set(CMAKE_SYSTEM_NAME  Windows)
-{platform.cmake_toolset_file()}'''
+        return ClangCL.CMAKE_CONFIG + platform.cmake_toolset_file()
 
     @staticmethod
     def cmake_generator():
         return Clang.cmake_generator()
+
+
+_TOOLSETS = {
+    ToolsetType.AUTO: Auto,
+    ToolsetType.MSVC: MSVC,
+    ToolsetType.VISUAL_STUDIO: MSVC,
+    ToolsetType.GCC: GCC,
+    ToolsetType.MINGW: MinGW,
+    ToolsetType.CLANG: Clang,
+    ToolsetType.CLANG_CL: ClangCL,
+}
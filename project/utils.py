@@ -24,6 +24,13 @@ def mkdir_parent(path):
     os.makedirs(path, exist_ok=True)
 
 
+@functools.lru_cache(maxsize=None)
+def which(exe, path=None):
+    # shutil.which walks the entire PATH (times PATHEXT on Windows); the
+    # result won't change while we're running.
+    return shutil.which(exe, path=path)
+
+
 def full_exe_name(exe):
     if not project.os.on_windows_like():
         # There's no PATHEXT on Linux.
@@ -31,7 +38,7 @@ def full_exe_name(exe):
     # b2 on Windows/Cygwin doesn't like it when the executable name doesn't
     # include the extension.
     dir_path = os.path.dirname(exe) or None
-    path = shutil.which(exe, path=dir_path)
+    path = which(exe, path=dir_path)
     if not path:
         raise RuntimeError(f"executable '{exe}' could not be found")
     if project.os.on_cygwin():
@@ -116,9 +123,10 @@ def temp_file(**kwargs):
 
 
 def env(name):
-    if name not in os.environ:
-        raise RuntimeError(f'undefined environment variable: {name}')
-    return os.environ[name]
+    try:
+        return os.environ[name]
+    except KeyError:
+        raise RuntimeError(f'undefined environment variable: {name}') from None
 
 
 def retry(exc_type, timeout=5, tries=3, backoff=2):